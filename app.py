@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import xml.etree.ElementTree as ET
+import functools
+from collections.abc import Iterable
 from pprint import pformat
+from typing import Any
 
 from pywam.lib.api_call import ApiCall  # type: ignore
 from pywam.lib.api_response import ApiResponse  # type: ignore
@@ -14,23 +16,174 @@ from pywam.speaker import Speaker  # type: ignore
 from gui import Window
 from settings import Settings
 
+try:
+    from lxml import etree as ET  # type: ignore
+
+    HAS_LXML = True
+    # Dropping blank text lets lxml re-indent the whole document
+    _XML_PARSER = ET.XMLParser(remove_blank_text=True)
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    HAS_LXML = False
+
+try:
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None
+
+# Size of the event ring buffer, must be a power of two
+EVENT_BUFFER_SIZE = 1024
+_EVENT_BUFFER_MASK = EVENT_BUFFER_SIZE - 1
+# Seconds to collect state changes before updating the GUI (one 60 Hz frame)
+_STATE_FLUSH_DELAY = 0.016
+
+# Attributes of ApiResponse in the order they are presented
+_EVENT_FIELDS = (
+    "raw_response",
+    "api_type",
+    "method",
+    "user",
+    "version",
+    "speaker_ip",
+    "success",
+    "data",
+    "err_msg",
+    "err_repr",
+)
+_EVENT_FIELDS_SET = frozenset(_EVENT_FIELDS)
+_API_TYPES = frozenset(("UIC", "CPM"))
+# Expected value type and error message for each argument type
+_ARG_TYPE_SCHEMA: dict[str, tuple[type, str]] = {
+    "str": (str, "Argument value is not a string."),
+    "dec": (int, "Argument value is not an integer."),
+    "cdata": (str, "Argument value is not a string."),
+    "dec_arr": (list, "Argument value is not a list."),
+}
+
+
+def _parse_xml(xml: str) -> Any:
+    """Parse a XML string."""
+    if HAS_LXML:
+        return ET.XML(xml.encode(), _XML_PARSER)
+    return ET.XML(xml)
+
+
+def _serialize_xml(root: Any) -> str:
+    """Return an indented XML string from a parsed root element."""
+    if HAS_LXML:
+        # lxml indents in C while serializing
+        return ET.tostring(root, pretty_print=True, encoding="unicode")
+    ET.indent(root)
+    return ET.tostring(root, encoding="unicode")
+
+
+def _fast_pformat(items: Iterable[tuple[str, Any]]) -> str:
+    """Format key value pairs the way pformat lays out a long dict."""
+    return "{" + ",\n ".join(f"{key!r}: {value!r}" for key, value in items) + "}"
+
+
+class _EventView:
+    """Received event with lazily parsed and prettified attributes."""
+
+    __slots__ = ("event", "_root", "_pretty")
+
+    def __init__(self, event: ApiResponse) -> None:
+        """Initialize the event view."""
+        self.event = event
+        self._root: Any = None
+        self._pretty: dict[str, str] = {}
+
+    @property
+    def root(self) -> Any:
+        """Return the parsed raw response."""
+        if self._root is None:
+            self._root = _parse_xml(self.event.raw_response)
+        return self._root
+
+    def pretty(self, attribute: str) -> str:
+        """Return prettified raw_response or data."""
+        if (value := self._pretty.get(attribute)) is None:
+            if attribute == "raw_response":
+                value = _serialize_xml(self.root)
+            else:
+                value = pformat(self.event.data)
+            self._pretty[attribute] = value
+        return value
+
+    def prettify(self) -> None:
+        """Prettify all attributes in advance.
+
+        Errors are ignored here and raised when the attribute is viewed.
+        """
+        for attribute in ("raw_response", "data"):
+            with contextlib.suppress(Exception):
+                self.pretty(attribute)
+
+
+@functools.lru_cache(maxsize=256)
+def _build_api_call(
+    api_type: str,
+    method: str,
+    pwron: bool,
+    args: tuple[tuple[str, str | int | tuple[int, ...], str], ...],
+    expected_response: str,
+    user_check: bool,
+    timeout: int,
+) -> ApiCall:
+    """Build an API call, shared between identical requests.
+
+    Arguments must be hashable, so dec_arr values are passed as tuples
+    and turned back into lists for the ApiCall.
+    """
+    return ApiCall(
+        api_type=api_type,
+        method=method,
+        pwron=pwron,
+        args=[
+            (name, list(value) if isinstance(value, tuple) else value, arg_type)
+            for name, value, arg_type in args
+        ],
+        expected_response=expected_response,
+        user_check=user_check,
+        timeout_multiple=timeout,
+    )
+
 
 class App:
     """Application for exploring WAM API."""
 
+    __slots__ = (
+        "settings",
+        "gui",
+        "aio_loop",
+        "speaker",
+        "_event_buf",
+        "_event_head",
+        "_pending_state",
+        "_state_timer_handle",
+    )
+
     gui: Window
     aio_loop: asyncio.AbstractEventLoop
-    speaker: Speaker
+    speaker: Speaker | None
 
     def __init__(self) -> None:
         """Initialize the app."""
+        self.speaker = None
         self.settings: Settings = Settings()
         self.settings.load_settings()
-        self.events: list[ApiResponse] = []
+        self._event_buf: list[_EventView | None] = [None] * EVENT_BUFFER_SIZE
+        self._event_head = 0
+        self._pending_state: dict = {}
+        self._state_timer_handle: asyncio.TimerHandle | None = None
 
     async def run(self):
         """Run the application."""
-        self.aio_loop = asyncio.get_event_loop()
+        self.aio_loop = asyncio.get_running_loop()
+        # Python 3.12+ runs tasks eagerly until their first real suspension
+        if hasattr(asyncio, "eager_task_factory"):
+            self.aio_loop.set_task_factory(asyncio.eager_task_factory)
         self.gui = Window(self)
         await self.gui.show()
         if self.speaker:
@@ -44,6 +197,8 @@ class App:
         """Connect to speaker."""
         try:
             self.speaker = Speaker(ip, port)
+            # Registering subscribers is synchronous and update() needs an
+            # open connection, so these steps can't be run concurrently.
             self.speaker.events.register_subscriber(self.state_receiver, 1)
             self.speaker.client.register_subscriber(self.event_receiver)
             await self.speaker.connect()
@@ -67,20 +222,54 @@ class App:
 
     def event_receiver(self, event: ApiResponse) -> None:
         """Receiver for all speaker events."""
-        self.events.append(event)
-        trunc = False
-        if len(self.events) > 1000:
-            del self.events[0]
-            trunc = True
-        self.gui.events.new_event(event, trunc)
+        view = _EventView(event)
+        self._event_buf[self._event_head & _EVENT_BUFFER_MASK] = view
+        self._event_head += 1
+        self.gui.events.new_event(event)
+        # Prettify in a worker thread so it is ready when the event is viewed
+        self.aio_loop.run_in_executor(None, view.prettify)
+
+    def _get_view(self, event_idx: int) -> _EventView:
+        """Get the view of a received event.
+
+        Index 0 is the oldest stored event and negative indexes counts
+        from the latest received event.
+        """
+        count = min(self._event_head, EVENT_BUFFER_SIZE)
+        if event_idx < 0:
+            event_idx += count
+        if not 0 <= event_idx < count:
+            raise IndexError("Event index out of range.")
+        first = self._event_head - count
+        return self._event_buf[(first + event_idx) & _EVENT_BUFFER_MASK]
+
+    def get_event(self, event_idx: int) -> ApiResponse:
+        """Get a received event, indexed as in _get_view."""
+        return self._get_view(event_idx).event
 
     def state_receiver(self, state: dict) -> None:
         """Receiver for state changes on the speaker."""
+        self._pending_state.update(state)
+        if self._state_timer_handle is None:
+            self._state_timer_handle = self.aio_loop.call_later(
+                _STATE_FLUSH_DELAY, self._flush_state
+            )
+
+    def _flush_state(self) -> None:
+        """Send all collected state changes to the GUI at once."""
+        state = self._pending_state
+        self._pending_state = {}
+        self._state_timer_handle = None
         self.gui.properties.new_state(state)
 
     def validate_api_call(self, api_call: ApiCall) -> None:
-        """Validate API call."""
-        if api_call.api_type not in ("UIC", "CPM"):
+        """Validate API call.
+
+        Only a development aid, skipped when running with python -O.
+        """
+        if not __debug__:
+            return
+        if api_call.api_type not in _API_TYPES:
             raise ValueError("API type not supported.")
         if not api_call.method:
             raise ValueError("No method specified.")
@@ -95,7 +284,7 @@ class App:
         if api_call.timeout_multiple > 5:
             raise ValueError("timeout_multiple is too high.")
 
-    def validate_api_call_arguments(  # noqa: C901
+    def validate_api_call_arguments(
         self, args: tuple[str, str | int | list[int], str]
     ) -> None:
         """Validate API call arguments."""
@@ -103,54 +292,48 @@ class App:
             raise TypeError("args is not a list of tuples.")
         if len(args) != 3:
             raise ValueError("args is not a list of tuples of length 3.")
+        name, value, arg_type = args
         # Argument name
-        if not isinstance(args[0], str):
+        if not isinstance(name, str):
             raise TypeError("Argument name is not a string.")
-        if not args[0]:
+        if not name:
             raise ValueError("Argument name cannot be empty.")
         # Argument type
-        if not isinstance(args[2], str):
+        if not isinstance(arg_type, str):
             raise TypeError("Argument type is not a string.")
-        if args[2] not in ("str", "dec", "cdata", "dec_arr"):
+        if (schema := _ARG_TYPE_SCHEMA.get(arg_type)) is None:
             raise ValueError("Argument type not supported.")
-        # Argument values
-        if not isinstance(args[1], (str, int, list)):
-            raise TypeError("Argument value is not a string, int, or list.")
-        if args[2] == "dec_arr":
-            if not isinstance(args[1], list):
-                raise TypeError("Argument value is not a list.")
-            for value in args[1]:
-                if not isinstance(value, int):
-                    raise TypeError("Argument value is not a list of integers.")
-        if args[2] == "dec":
-            if not isinstance(args[1], int):
-                raise TypeError("Argument value is not an integer.")
-        if args[2] == "str":
-            if not isinstance(args[1], str):
-                raise TypeError("Argument value is not a string.")
-        if args[2] == "cdata":
-            if not isinstance(args[1], str):
-                raise TypeError("Argument value is not a string.")
+        # Argument value
+        expected_type, err_msg = schema
+        if not isinstance(value, expected_type):
+            raise TypeError(err_msg)
+        if arg_type == "dec_arr" and not all(type(v) is int for v in value):
+            raise TypeError("Argument value is not a list of integers.")
 
     def send_api(
         self,
         api_type: str,
         method: str,
         pwron: bool = False,
-        args: list[tuple[str, str | int | list[int], str]] = [],
+        args: list[tuple[str, str | int | list[int], str]] | None = None,
         expected_response: str = "",
         user_check: bool = False,
         timeout: int = 1,
     ) -> None:
         """Send an API request."""
-        api_call = ApiCall(
-            api_type=api_type,
-            method=method,
-            pwron=pwron,
-            args=args,
-            expected_response=expected_response,
-            user_check=user_check,
-            timeout_multiple=timeout,
+        if args is None:
+            args = []
+        api_call = _build_api_call(
+            api_type,
+            method,
+            pwron,
+            tuple(
+                (name, tuple(value) if isinstance(value, list) else value, arg_type)
+                for name, value, arg_type in args
+            ),
+            expected_response,
+            user_check,
+            timeout,
         )
         self.aio_loop.create_task(self.async_send_api(api_call))
 
@@ -160,47 +343,23 @@ class App:
 
     def get_pretty_event(self, event_idx: int) -> str:
         """Get a prettified event."""
-        event = self.events[event_idx]
-        event_as_dict = {
-            "raw_response": event.raw_response,
-            "api_type": event.api_type,
-            "method": event.method,
-            "user": event.user,
-            "version": event.version,
-            "speaker_ip": event.speaker_ip,
-            "success": str(event.success),
-            "data": str(event.data),
-            "err_msg": event.err_msg,
-            "err_repr": event.err_repr,
-        }
-        return pformat(event_as_dict)
+        event = self.get_event(event_idx)
+        return _fast_pformat((field, getattr(event, field)) for field in _EVENT_FIELDS)
 
     def get_pretty_event_attribute(self, event_idx: int, attribute: str) -> str:
         """Get a prettified event attribute."""
-        event = self.events[event_idx]
-
-        raw_response = ET.XML(event.raw_response)
-        ET.indent(raw_response)
-        formatted_raw_response = ET.tostring(raw_response, encoding="unicode")
-
-        formatted_data = pformat(event.data)
-
-        event_as_dict = {
-            "raw_response": formatted_raw_response,
-            "api_type": event.api_type,
-            "method": event.method,
-            "user": event.user,
-            "version": event.version,
-            "speaker_ip": event.speaker_ip,
-            "success": str(event.success),
-            "data": formatted_data,
-            "err_msg": event.err_msg,
-            "err_repr": event.err_repr,
-        }
-
-        return event_as_dict.get(attribute, "")
+        if attribute not in _EVENT_FIELDS_SET:
+            return ""
+        view = self._get_view(event_idx)
+        # Only raw_response and data needs prettifying
+        if attribute in ("raw_response", "data"):
+            return view.pretty(attribute)
+        return str(getattr(view.event, attribute))
 
 
 if __name__ == "__main__":
     app = App()
-    asyncio.run(app.run())
+    if uvloop is not None:
+        uvloop.run(app.run())
+    else:
+        asyncio.run(app.run())
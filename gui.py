@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import queue
 import time
 import tkinter as tk
-from datetime import datetime
+from collections import OrderedDict
+from logging.handlers import QueueHandler
 from tkinter import messagebox as tkmsgbox
 from tkinter import ttk
 from typing import TYPE_CHECKING
@@ -26,23 +28,33 @@ LOGLEVELS = {
     "ERROR": "red",
     "CRITICAL": "red",
 }
-
-
-class TkTextLogHandler(logging.Handler):
-    """Custom log handler for logging to TkInter Text."""
-
-    def __init__(self, widget: tk.Text) -> None:
-        """Initialize the handler."""
-        super().__init__()
-        self.widget = widget
-
-    def emit(self, record: logging.LogRecord) -> None:
-        """Emit a record."""
-        msg = self.format(record)
-        self.widget.configure(state=tk.NORMAL)
-        self.widget.insert(tk.END, msg + "\n", record.levelname)
-        self.widget.configure(state=tk.DISABLED)
-        self.widget.yview(tk.END)
+_LOGLEVEL_NAMES = tuple(LOGLEVELS)
+_LOGLEVEL_VALUES = tuple(getattr(logging, name) for name in _LOGLEVEL_NAMES)
+# Seconds between Tkinter updates (about 60 frames per second)
+UI_REFRESH_INTERVAL = 0.016
+# Milliseconds between saving changed settings
+SETTINGS_SAVE_INTERVAL = 500
+# Milliseconds between writing queued log records to the log widget
+LOG_FLUSH_INTERVAL = 80
+# Maximum number of lines kept in the log
+MAX_LOG_LINES = 5000
+# Maximum number of events in the event list, and how many to remove at once
+# when it is full. Must not be more than the number of events the app keeps.
+MAX_EVENTS = 1000
+EVENT_TRIM_SIZE = 100
+# Milliseconds the event list flashes on new events
+EVENT_FLASH_TIME = 100
+# Number of prettified event attributes to remember for view and copy
+ATTRIBUTE_CACHE_SIZE = 128
+
+# Keep event values on one row in the event treeview
+_STRIP_LINE_BREAKS = str.maketrans("", "", "\r\n\t")
+
+
+def _hms() -> str:
+    """Return current local time as HH:MM:SS."""
+    t = time.localtime()
+    return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
 
 
 class Window(tk.Tk):
@@ -70,19 +82,28 @@ class Window(tk.Tk):
         if self.app.settings.error:
             tkmsgbox.showerror("Error loading settings", self.app.settings.error)
             self.close()
+            return
+
+        self.after(SETTINGS_SAVE_INTERVAL, self.save_settings)
 
     async def show(self) -> None:
         """Show gui with asyncio loop and Tkinter main loop."""
         # Set minimum window size to current window size
         self.update()
         self.minsize(self.winfo_width(), self.winfo_height())
-        # Run the loop
+        # Run the loop, asyncio handles its callbacks while we sleep
         while self._show:
             self.update()
-            await asyncio.sleep(0)
+            await asyncio.sleep(UI_REFRESH_INTERVAL)
+
+    def save_settings(self) -> None:
+        """Save changed settings, without writing to disk on every change."""
+        self.app.settings.save_changes()
+        self.after(SETTINGS_SAVE_INTERVAL, self.save_settings)
 
     def close(self) -> None:
         """Close the gui."""
+        self.app.settings.save_changes()
         self._show = False
         self.destroy()
 
@@ -107,7 +128,7 @@ class Header(tk.Frame):
             self,
             width=25,
             state="readonly",
-            values=[spk.name for spk in self.app.settings.hosts],
+            values=self.app.settings.host_names,
         )
         self.lbl_ip = ttk.Label(self, text="Speaker ip:")
         self.ent_ip = ttk.Entry(self, width=20)
@@ -119,7 +140,7 @@ class Header(tk.Frame):
         )
         self.lbl_loglevel = ttk.Label(self, text="Log level:")
         self.cbx_loglevel = ttk.Combobox(
-            self, width=25, state="readonly", values=list(LOGLEVELS)
+            self, width=25, state="readonly", values=_LOGLEVEL_NAMES
         )
         self.btn_send_api = ttk.Button(
             self, text="Send API", command=self.show_send_api
@@ -154,15 +175,13 @@ class Header(tk.Frame):
 
     def select_speaker(self, tkinter_event) -> None:
         """Select speaker."""
+        idx = self.cbx_name.current()
+        host = self.app.settings.hosts[idx]
         self.ent_ip.delete(0, tk.END)
-        self.ent_ip.insert(
-            tk.END, self.app.settings.hosts[self.cbx_name.current()].host
-        )
+        self.ent_ip.insert(tk.END, host.host)
         self.ent_port.delete(0, tk.END)
-        self.ent_port.insert(
-            tk.END, str(self.app.settings.hosts[self.cbx_name.current()].port)
-        )
-        self.app.settings.default_host = self.cbx_name.current()
+        self.ent_port.insert(tk.END, str(host.port))
+        self.app.settings.default_host = idx
 
     def connect(self) -> None:
         """Connect to speaker."""
@@ -191,9 +210,9 @@ class Header(tk.Frame):
 
     def select_loglevel(self, tkinter_event) -> None:
         """Changer level of logger."""
-        level = getattr(logging, self.cbx_loglevel.get())
-        _LOGGER.setLevel(level)
-        self.app.settings.loglevel = self.cbx_loglevel.current()
+        idx = self.cbx_loglevel.current()
+        _LOGGER.setLevel(_LOGLEVEL_VALUES[idx])
+        self.app.settings.loglevel = idx
 
     def show_send_api(self) -> None:
         """Show Send API window."""
@@ -211,6 +230,8 @@ class Properties(tk.Frame):
         super().__init__(parent, *args, **kwargs)
         self.parent = parent
         self.app = app
+        # Shown type and value of each attribute
+        self._last_values: dict[str, tuple[str, str]] = {}
 
         self.create_widgets()
         self.layout_widgets()
@@ -248,36 +269,41 @@ class Properties(tk.Frame):
         # Populate treeview
         ws = WamAttributes()
         states = ws.get_state_copy()
-        time_now = datetime.now().strftime("%H:%M:%S")
+        time_now = _hms()
+        # Local names for what is used in the loop
+        insert = self.trv_state.insert
+        last_values = self._last_values
+        end = tk.END
         for key, value in states.items():
-            if value is None:
-                var_type = ""
-            else:
-                var_type = str(type(value))[8:][:-2]
-            if isinstance(value, list | tuple):
-                value = ", ".join([str(v) for v in value])
+            value_type = type(value)
+            var_type = "" if value is None else value_type.__name__
+            if value_type is list or value_type is tuple:
+                value = ", ".join(map(str, value))
             else:
                 value = str(value)
-            self.trv_state.insert(
-                parent="",
-                index=tk.END,
-                iid=key,
-                values=(time_now, key, var_type, value),
+            last_values[key] = (var_type, value)
+            insert(
+                parent="", index=end, iid=key, values=(time_now, key, var_type, value)
             )
 
     def new_state(self, state: dict):
         """Change the state of the speaker."""
-        time_now = datetime.now().strftime("%H:%M:%S")
+        time_now = _hms()
+        # Local names for what is used in the loop
+        item = self.trv_state.item
+        last_values = self._last_values
         for key, value in state.items():
-            if value is None:
-                var_type = ""
-            else:
-                var_type = str(type(value))[8:][:-2]
-            if isinstance(value, list | tuple):
-                value = ", ".join([str(v) for v in value])
+            value_type = type(value)
+            var_type = "" if value is None else value_type.__name__
+            if value_type is list or value_type is tuple:
+                value = ", ".join(map(str, value))
             else:
                 value = str(value)
-            self.trv_state.item(key, values=(time_now, key, var_type, value))
+            # Only touch rows that has changed
+            if last_values.get(key) == (var_type, value):
+                continue
+            last_values[key] = (var_type, value)
+            item(key, values=(time_now, key, var_type, value))
 
 
 class Events(tk.Frame):
@@ -288,6 +314,12 @@ class Events(tk.Frame):
         super().__init__(parent, *args, **kwargs)
         self.parent = parent
         self.app = app
+        self._flash_pending = False
+        self._focused = False
+        # Number of rows in the event list
+        self._event_count = 0
+        # Keyed on the event itself, as list indexes shift with new events
+        self._attribute_cache: OrderedDict[tuple[ApiResponse, str], str] = OrderedDict()
 
         self.create_widgets()
         self.layout_widgets()
@@ -328,6 +360,9 @@ class Events(tk.Frame):
         self.lst_events.bind("<<ListboxSelect>>", self.select_lst_event)
         self.lst_events.bind("<Button-3>", self.right_click_lst_events)
         self.trv_event.bind("<Button-3>", self.right_click_trv_events)
+        for widget in (self.lst_events, self.trv_event):
+            widget.bind("<FocusIn>", self.focus_in)
+            widget.bind("<FocusOut>", self.focus_out)
 
     def layout_widgets(self) -> None:
         """Layout widgets."""
@@ -340,35 +375,51 @@ class Events(tk.Frame):
         self.trv_event.grid(row=0, column=3, sticky=tk.NSEW)
         self.vsb_event.grid(row=0, column=4, sticky=tk.NS)
 
-    def new_event(self, event: ApiResponse, trunc: bool = False) -> None:
+    def new_event(self, event: ApiResponse) -> None:
         """Add a new event in event list."""
         # Add event to list
-        time_now = datetime.now().strftime("%H:%M:%S")
+        time_now = _hms()
         self.lst_events.insert(tk.END, f"{time_now} - {event.method}")
-        if trunc:
-            self.lst_events.delete(0)
+        self._event_count += 1
+        if self._event_count > MAX_EVENTS:
+            self.lst_events.delete(0, EVENT_TRIM_SIZE - 1)
+            self._event_count -= EVENT_TRIM_SIZE
         # Scroll down if not in focus
-        focus = self.parent.focus_get()
-        if focus in (self.lst_events, self.trv_event):
+        if self._focused:
             self.lst_events.yview(tk.END)
-        # Flash list
-        background = self.lst_events.cget("background")
-        self.lst_events.config(background="red")
-        self.parent.update()
-        time.sleep(0.1)
+        # Flash list, events arriving during a flash share it
+        if not self._flash_pending:
+            self._flash_pending = True
+            background = self.lst_events.cget("background")
+            self.lst_events.config(background="red")
+            self.after(EVENT_FLASH_TIME, self.end_flash, background)
+
+    def focus_in(self, tkinter_event) -> None:
+        """Event list or treeview got focus."""
+        self._focused = True
+
+    def focus_out(self, tkinter_event) -> None:
+        """Event list or treeview lost focus."""
+        self._focused = False
+
+    def end_flash(self, background: str) -> None:
+        """Restore the event list after a flash."""
         self.lst_events.config(background=background)
-        self.parent.update()
+        self._flash_pending = False
+
+    def event_idx(self, row: int) -> int:
+        """Return the app event index of a row in the event list."""
+        # The list holds the latest events, so count from the end
+        return row - self._event_count
 
     def select_lst_event(self, tkinter_event) -> None:
         """Show selected event in treeview."""
-        if not self.lst_events.curselection():
+        if not (selection := self.lst_events.curselection()):
             return
-        for row in self.trv_event.get_children():
-            self.trv_event.delete(row)
-        event = self.app.events[self.lst_events.curselection()[0]]
+        self.trv_event.delete(*self.trv_event.get_children())
+        event = self.app.get_event(self.event_idx(selection[0]))
         for key in event.__slots__:
-            value = str(getattr(event, key, ""))
-            value = "".join([v.strip() for v in value.splitlines()])
+            value = str(getattr(event, key, "")).translate(_STRIP_LINE_BREAKS)
             self.trv_event.insert(parent="", index=tk.END, iid=key, values=(key, value))
 
     def right_click_trv_events(self, tk_event) -> None:
@@ -379,9 +430,10 @@ class Events(tk.Frame):
 
     def right_click_lst_events(self, tk_event) -> None:
         """Show context menu for event list."""
+        idx = self.lst_events.nearest(tk_event.y)
         self.lst_events.selection_clear(0, tk.END)
-        self.lst_events.selection_set(self.lst_events.nearest(tk_event.y))
-        self.lst_events.activate(self.lst_events.nearest(tk_event.y))
+        self.lst_events.selection_set(idx)
+        self.lst_events.activate(idx)
         try:
             self.mnu_lst_event.tk_popup(tk_event.x_root, tk_event.y_root)
         finally:
@@ -389,22 +441,33 @@ class Events(tk.Frame):
 
     def get_event_attribute(self) -> tuple[str, str]:
         """Get selected event attribute."""
-        if (item := self.trv_event.selection()) is not None and (
-            self.lst_events.curselection()
+        if (item := self.trv_event.selection()) and (
+            selection := self.lst_events.curselection()
         ):
-            idx = self.lst_events.curselection()[0]
+            idx = self.event_idx(selection[0])
             key = self.trv_event.item(item[0], "values")[0]
-            method = self.app.events[idx].method
-            attribute = self.app.get_pretty_event_attribute(idx, key)
-            return (f"{method} - {key}", attribute)
+            event = self.app.get_event(idx)
+            cache_key = (event, key)
+            if (attribute := self._attribute_cache.get(cache_key)) is None:
+                attribute = self.app.get_pretty_event_attribute(idx, key)
+                self._attribute_cache[cache_key] = attribute
+                if len(self._attribute_cache) > ATTRIBUTE_CACHE_SIZE:
+                    self._attribute_cache.popitem(last=False)
+            else:
+                self._attribute_cache.move_to_end(cache_key)
+            return (f"{event.method} - {key}", attribute)
         else:
             return ("", "")
 
     def copy_event_detail(self) -> None:
         """Copy event details to clipboard."""
         title, data = self.get_event_attribute()
+        if not title:
+            return
         self.parent.clipboard_clear()
         self.parent.clipboard_append(f"{title}\n\n{data}")
+        # Make sure the clipboard is handed over to the system
+        self.parent.update()
 
     def view_event_detail(self) -> None:
         """View event detail."""
@@ -413,12 +476,14 @@ class Events(tk.Frame):
 
     def copy_full_event(self) -> None:
         """Copy an event to clipboard."""
-        if not self.lst_events.curselection():
+        if not (selection := self.lst_events.curselection()):
             return
-        idx = self.lst_events.curselection()[0]
+        idx = self.event_idx(selection[0])
         event = self.app.get_pretty_event(idx)
         self.parent.clipboard_clear()
         self.parent.clipboard_append(event)
+        # Make sure the clipboard is handed over to the system
+        self.parent.update()
 
 
 class Logging(tk.Frame):
@@ -459,14 +524,40 @@ class Logging(tk.Frame):
 
     def init_logger(self) -> None:
         """Initialize the logger."""
-        log_handler = TkTextLogHandler(self.txt_log)
+        self.log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self.log_lines = 0
+        log_handler = QueueHandler(self.log_queue)
         log_formatter = logging.Formatter(
             "%(asctime)s - %(levelname)s: %(name)s - %(message)s"
         )
         log_handler.setFormatter(log_formatter)
         _LOGGER.addHandler(log_handler)
-        level = getattr(logging, self.parent.header.cbx_loglevel.get())
-        _LOGGER.setLevel(level)
+        _LOGGER.setLevel(_LOGLEVEL_VALUES[self.parent.header.cbx_loglevel.current()])
+        self.after(LOG_FLUSH_INTERVAL, self.flush_log)
+
+    def flush_log(self) -> None:
+        """Write all queued log records to the log in one go."""
+        # Pairs of text and tag, in the order Text.insert takes them
+        chunks: list[str] = []
+        while not self.log_queue.empty():
+            record = self.log_queue.get_nowait()
+            # QueueHandler has already formatted the message
+            chunks.extend((record.msg + "\n", record.levelname))
+            self.log_lines += record.msg.count("\n") + 1
+        if chunks:
+            # Only follow new records if the log is scrolled to the bottom
+            at_bottom = self.txt_log.yview()[1] > 0.98
+            self.txt_log.configure(state=tk.NORMAL)
+            self.txt_log.insert(tk.END, *chunks)
+            # Remove the oldest lines to keep the log from growing forever
+            if self.log_lines > MAX_LOG_LINES:
+                drop = self.log_lines - MAX_LOG_LINES
+                self.txt_log.delete("1.0", f"{drop + 1}.0")
+                self.log_lines = MAX_LOG_LINES
+            self.txt_log.configure(state=tk.DISABLED)
+            if at_bottom:
+                self.txt_log.yview_moveto(1.0)
+        self.after(LOG_FLUSH_INTERVAL, self.flush_log)
 
 
 class SendApiWindows(tk.Toplevel):
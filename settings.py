@@ -6,6 +6,11 @@ import json
 from pathlib import Path
 from typing import NamedTuple
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 SETTINGS_FILE = Path(__file__).parent.joinpath("settings.json")
 DEFAULT_SETTINGS = {
     "hosts": [{"name": "Speaker", "host": "192.168.1.100", "port": 55001}],
@@ -28,12 +33,18 @@ class Settings:
     def __init__(self) -> None:
         """Initialize settings."""
         self._settings: dict = {}
+        self._hosts_cache: list[Host] | None = None
+        self._dirty = False
 
     def load_settings(self) -> None:
         """Load settings."""
+        self._hosts_cache = None
         try:
-            with open(SETTINGS_FILE) as f:
-                self._settings = json.load(f)
+            with open(SETTINGS_FILE, "rb") as f:
+                if orjson is not None:
+                    self._settings = orjson.loads(f.read())
+                else:
+                    self._settings = json.load(f)
         except FileNotFoundError:
             self._settings = DEFAULT_SETTINGS
         except Exception as err:
@@ -41,8 +52,26 @@ class Settings:
 
     def save_settings(self) -> None:
         """Save settings."""
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(self._settings, f, sort_keys=True, indent=4)
+        if orjson is not None:
+            options = (
+                orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE
+            )
+            with open(SETTINGS_FILE, "wb") as f:
+                f.write(orjson.dumps(self._settings, option=options))
+        else:
+            with open(SETTINGS_FILE, "w") as f:
+                json.dump(self._settings, f, sort_keys=True, indent=2)
+                f.write("\n")
+        self._dirty = False
+
+    def save_changes(self) -> None:
+        """Save settings if they have been changed since last save."""
+        if self._dirty:
+            self.save_settings()
+
+    def _mark_dirty(self) -> None:
+        """Mark settings as changed, to be saved by save_changes."""
+        self._dirty = True
 
     @property
     def error(self) -> str | None:
@@ -52,13 +81,23 @@ class Settings:
     @property
     def hosts(self) -> list[Host]:
         """Return list of hosts."""
-        return [Host(**host) for host in self._settings.get("hosts", [])]
+        if self._hosts_cache is None:
+            self._hosts_cache = [
+                Host(**host) for host in self._settings.get("hosts", [])
+            ]
+        return self._hosts_cache
 
     @hosts.setter
     def hosts(self, hosts: list[Host]) -> None:
         """Set list of hosts."""
-        self._settings["hosts"] = [host._asdict for host in hosts]
-        self.save_settings()
+        self._settings["hosts"] = [host._asdict() for host in hosts]
+        self._hosts_cache = list(hosts)
+        self._mark_dirty()
+
+    @property
+    def host_names(self) -> list[str]:
+        """Return names of all hosts."""
+        return [host["name"] for host in self._settings.get("hosts", [])]
 
     @property
     def default_host(self) -> int:
@@ -70,10 +109,10 @@ class Settings:
         """Set default host."""
         if not isinstance(default_host, int):
             raise TypeError("Default host must be an integer")
-        if default_host < 0 or default_host >= len(self.hosts):
+        if default_host < 0 or default_host >= len(self._settings.get("hosts", [])):
             raise ValueError("Default host must be one of the hosts")
         self._settings["default_host"] = default_host
-        self.save_settings()
+        self._mark_dirty()
 
     @property
     def loglevel(self) -> int:
@@ -88,4 +127,4 @@ class Settings:
         if not -1 < loglevel < 5:
             raise ValueError("loglevel must be between 0 and 4")
         self._settings["loglevel"] = loglevel
-        self.save_settings()
+        self._mark_dirty()